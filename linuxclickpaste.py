@@ -8,21 +8,22 @@ import gi
 gi.require_version('Gtk', '4.0')
 gi.require_version('Gdk', '4.0')
 
-from gi.repository import Gtk, Gdk, GLib
+from gi.repository import Gtk, Gdk, GLib, Gio
 
 # Handle optional dependencies gracefully
 APPINDICATOR_AVAILABLE = False
-AppIndicator3 = None
+AppIndicator = None
 KEYBINDER_AVAILABLE = False
 Keybinder = None
 
-# Try to import AppIndicator3 separately (avoiding GTK version conflicts)
+# Tray icon through libayatana-appindicator-glib, which takes a Gio.Menu.
+# AppIndicator3 cannot be used: its menus are GTK 3 widgets, and GTK 3 can
+# never be loaded into this GTK 4 process.
 try:
-    import gi as gi_indicator
-    gi_indicator.require_version('AppIndicator3', '0.1')
-    from gi.repository import AppIndicator3
+    gi.require_version('AyatanaAppIndicatorGlib', '2.0')
+    from gi.repository import AyatanaAppIndicatorGlib as AppIndicator
     APPINDICATOR_AVAILABLE = True
-except:
+except (ValueError, ImportError):
     pass
 
 # Try to import Keybinder
@@ -34,24 +35,80 @@ except:
 
 import subprocess
 import time
+import codecs
+import copy
+import ctypes
+import ctypes.util
+import functools
+import importlib.util
 import threading
 import json
 import os
+import queue
+import select
+import shutil
+import signal
+import socket
+import string
 import sys
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import Optional, Dict, List, Callable
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Callable, Tuple, Iterable, Iterator
 from enum import Enum, IntEnum
 import logging
 from collections import deque
 
-# For keyboard simulation
-try:
+# For keyboard simulation (python-xlib is only imported when first needed)
+@functools.lru_cache(maxsize=None)
+def _xlib_loader():
+    """Import python-xlib, returning (X, XK, xtest, XDisplay)"""
+    # Must come before any Display is created: swaps python-xlib's no-op
+    # locks for real ones, as connections are shared across threads
+    import Xlib.threaded  # noqa: F401
     from Xlib import X, XK, display as XDisplay
     from Xlib.ext import xtest
-    XLIB_AVAILABLE = True
+    return X, XK, xtest, XDisplay
+
+@functools.lru_cache(maxsize=None)
+def xlib_available() -> bool:
+    """Check whether python-xlib is installed, without importing it"""
+    return importlib.util.find_spec('Xlib') is not None
+
+def x_display_reachable() -> bool:
+    """Check that $DISPLAY names an X server accepting connections"""
+    host, _, screen = os.environ.get('DISPLAY', '').rpartition(':')
+    number = screen.split('.')[0]
+    if not number.isdigit():
+        return False
+    if host and host != 'unix':
+        return True  # TCP display (e.g. SSH forwarding); only opening it tells
+    
+    # Connecting to the local socket is enough, no X handshake needed
+    for path in (f'\0/tmp/.X11-unix/X{number}', f'/tmp/.X11-unix/X{number}'):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(0.05)
+            sock.connect(path)
+            return True
+        except OSError:
+            continue
+        finally:
+            sock.close()
+    return False
+
+# Kernel uinput device for the uinput backend
+try:
+    from evdev import UInput, ecodes
+    EVDEV_AVAILABLE = True
 except ImportError:
-    XLIB_AVAILABLE = False
+    EVDEV_AVAILABLE = False
+
+# Faster settings (de)serialization if available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Setup logging
 logging.basicConfig(
@@ -60,11 +117,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger('LinuxClickPaste')
 
+# Printable ASCII keysyms equal their codepoints, no XK name lookup needed
+_ASCII_KEYSYMS = {chr(c): c for c in range(0x20, 0x7f)}
+
+# Encoding errors become NULs, which keystroke plans leave unmapped; the
+# handler runs once per run of non-ASCII characters, not per character
+codecs.register_error('linuxclickpaste.unmapped',
+                      lambda e: ('\0' * (e.end - e.start), e.end))
+
+# Parsed settings keyed by path, reused while the file's mtime is unchanged
+_settings_cache: Dict[Path, Tuple[int, 'Settings']] = {}
+
 class TypeMethod(Enum):
     """Typing methods available"""
     XTEST = "xtest"          # Direct X11 key simulation (like SendKeys)
     XDOTOOL = "xdotool"      # External tool (works on X11 and XWayland)
     YDOTOOL = "ydotool"      # Works on both X11 and Wayland
+    UINPUT = "uinput"        # Virtual kernel keyboard, bypasses the display server
 
 class HotKeyMode(Enum):
     """Hotkey behavior modes"""
@@ -84,10 +153,11 @@ class Settings:
     # Key delays
     key_delay_ms: int = 5
     start_delay_ms: int = 100
+    keydown_hold_ms: float = 0.0  # Gap between key press and release
     
     # Hotkey settings
     hotkey: Optional[str] = None
-    hotkey_modifiers: List[str] = field(default_factory=list)
+    hotkey_modifiers: Tuple[str, ...] = ()  # Immutable; rebind to change
     hotkey_mode: HotKeyMode = HotKeyMode.TARGET
     
     # Behavior settings
@@ -100,67 +170,348 @@ class Settings:
     show_notifications: bool = True
     run_elevated: bool = False
     
+    # Fields written to the settings file, in file order
+    _SERIALIZABLE_FIELDS = (
+        'key_delay_ms', 'start_delay_ms', 'keydown_hold_ms',
+        'hotkey', 'hotkey_modifiers', 'hotkey_mode',
+        'confirm', 'confirm_over', 'type_method',
+        'start_minimized', 'show_notifications', 'run_elevated'
+    )
+    
     @classmethod
     def load(cls, path: Path) -> 'Settings':
         """Load settings from file"""
         if path.exists():
             try:
-                with open(path, 'r') as f:
-                    data = json.load(f)
-                    # Convert enums
-                    if 'hotkey_mode' in data:
-                        data['hotkey_mode'] = HotKeyMode(data['hotkey_mode'])
-                    if 'type_method' in data:
-                        data['type_method'] = TypeMethod(data['type_method'])
-                    return cls(**data)
+                mtime = path.stat().st_mtime_ns
+                cached = _settings_cache.get(path)
+                if cached and cached[0] == mtime:
+                    return copy.deepcopy(cached[1])
+                
+                raw = path.read_bytes()
+                data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                # Convert enums and the JSON list of modifiers
+                if 'hotkey_modifiers' in data:
+                    data['hotkey_modifiers'] = tuple(data['hotkey_modifiers'])
+                if 'hotkey_mode' in data:
+                    data['hotkey_mode'] = HotKeyMode(data['hotkey_mode'])
+                if 'type_method' in data:
+                    data['type_method'] = TypeMethod(data['type_method'])
+                settings = cls(**data)
+                # Seeded so saving unchanged settings rewrites nothing; the
+                # deepcopies handed out carry it along
+                settings._last_serialized = settings._serialize()
+                _settings_cache[path] = (mtime, settings)
+                return copy.deepcopy(settings)
             except Exception as e:
                 logger.error(f"Failed to load settings: {e}")
         return cls()
     
+    def __post_init__(self):
+        # Unsaved changes; private attributes are never persisted
+        self._dirty = False
+        self._last_serialized: Optional[bytes] = None
+    
+    def mark_dirty(self):
+        """Record that settings changed and need saving"""
+        self._dirty = True
+    
+    def _serialize(self) -> bytes:
+        """Encode the listed fields as the settings file contents"""
+        # Serialize the listed fields directly; enums are stored by value
+        data = {name: getattr(self, name) for name in self._SERIALIZABLE_FIELDS}
+        data['hotkey_mode'] = self.hotkey_mode.value
+        data['type_method'] = self.type_method.value
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        return json.dumps(data, indent=2).encode()
+    
     def save(self, path: Path):
-        """Save settings to file"""
+        """Save settings to file if they changed since the last save"""
+        if not self._dirty:
+            return
+        
         try:
             path.parent.mkdir(parents=True, exist_ok=True)
-            data = self.__dict__.copy()
-            # Convert enums to values
-            data['hotkey_mode'] = self.hotkey_mode.value
-            data['type_method'] = self.type_method.value
-            with open(path, 'w') as f:
-                json.dump(data, f, indent=2)
+            payload = self._serialize()
+            
+            # Changes that were undone again leave nothing to write
+            if payload == self._last_serialized:
+                self._dirty = False
+                return
+            
+            # Write then rename so a crash never leaves a partial file
+            tmp = path.with_suffix('.tmp')
+            tmp.write_bytes(payload)
+            os.replace(tmp, path)
+            self._last_serialized = payload
+            self._dirty = False
         except Exception as e:
             logger.error(f"Failed to save settings: {e}")
 
 class InputSimulator:
     """Base class for input simulation"""
     
+    # Typographic characters rarely on a keymap, replaced with ASCII
+    NORMALIZE_TABLE = str.maketrans({
+        '\u2018': "'", '\u2019': "'", '\u201c': '"', '\u201d': '"',
+        '\u2013': '-', '\u2014': '-', '\u2026': '...', '\u00a0': ' ',
+    })
+    
     def __init__(self):
         self.cancel_token = threading.Event()
+        self.keydown_hold_ms = 0.0
+        
+        # Self-pipe mirroring cancel_token so waits can select() on it
+        self._cancel_r, self._cancel_w = os.pipe()
+        os.set_blocking(self._cancel_r, False)
+        os.set_blocking(self._cancel_w, False)
+    
+    def __del__(self):
+        for fd in (getattr(self, '_cancel_r', None), getattr(self, '_cancel_w', None)):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
     
     def type_text(self, text: str, delay_ms: int) -> bool:
-        """Type text with given delay. Returns False if cancelled."""
+        """Type text with given delay. Returns False if cancelled.
+        
+        A cancel stays in effect until reset_cancel(), which the caller
+        makes once per paste before any of its waits.
+        """
         raise NotImplementedError
     
-    def prepare_keystrokes(self, text: str) -> List[str]:
+    def prepare_keystrokes(self, text: str) -> Iterable[str]:
         """Prepare text for typing (handle special characters)"""
         raise NotImplementedError
     
     def cancel(self):
         """Cancel ongoing typing"""
         self.cancel_token.set()
+        try:
+            os.write(self._cancel_w, b'x')
+        except BlockingIOError:
+            pass  # Pipe already full of wakeups
+    
+    def close(self):
+        """Release devices or connections held by the simulator"""
+    
+    def reset_cancel(self):
+        """Clear any earlier cancellation before starting a paste"""
+        self.cancel_token.clear()
+        try:
+            while os.read(self._cancel_r, 64):
+                pass
+        except BlockingIOError:
+            pass
+    
+    # Largest write to a helper's stdin between cancel checks
+    PIPE_CHUNK = 65536
+    
+    def _wait_process(self, proc: subprocess.Popen, data: bytes = b'') -> bool:
+        """Feed data to a helper's stdin and wait for it to exit. Returns False if cancelled."""
+        # A pidfd becomes readable when the process exits (Linux 5.3+), so
+        # both exit and cancel wake the select without polling
+        try:
+            pidfd = os.pidfd_open(proc.pid)
+        except (AttributeError, OSError):
+            pidfd = None
+        
+        # Written without blocking so a cancel is seen while the helper is
+        # still working through earlier chunks
+        pending = memoryview(data)
+        stdin = None
+        if proc.stdin:
+            if pending:
+                stdin = proc.stdin.fileno()
+                os.set_blocking(stdin, False)
+            else:
+                proc.stdin.close()
+        
+        try:
+            fds = [self._cancel_r] if pidfd is None else [self._cancel_r, pidfd]
+            timeout = 0.05 if pidfd is None else None
+            while proc.poll() is None:
+                _, writable, _ = select.select(fds, [] if stdin is None else [stdin],
+                                               [], timeout)
+                if self.cancel_token.is_set():
+                    self._terminate(proc, pidfd)
+                    return False
+                
+                if writable:
+                    try:
+                        pending = pending[os.write(stdin, pending[:self.PIPE_CHUNK]):]
+                    except BrokenPipeError:
+                        pending = pending[:0]
+                    if not pending:
+                        # EOF tells the helper the text is complete
+                        proc.stdin.close()
+                        stdin = None
+            return True
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+            if proc.stdin and not proc.stdin.closed:
+                proc.stdin.close()
+    
+    def _run_helper(self, argv: Tuple[str, ...], text: str, **popen_kwargs) -> bool:
+        """Type text through a helper reading it from stdin. Returns False if cancelled or failed."""
+        try:
+            # Feed the text on stdin; argv is limited by ARG_MAX and
+            # visible to other users in /proc/<pid>/cmdline
+            proc = subprocess.Popen(argv, stdin=subprocess.PIPE, **popen_kwargs)
+            
+            if not self._wait_process(proc, text.encode('utf-8')):
+                return False
+            return proc.returncode == 0
+        except Exception as e:
+            logger.error(f"{os.path.basename(argv[0])} error: {e}")
+            return False
+    
+    @staticmethod
+    def _terminate(proc: subprocess.Popen, pidfd: Optional[int]):
+        """Stop a helper process and reap it"""
+        try:
+            if pidfd is not None:
+                # Signals through the pidfd cannot hit a recycled pid
+                signal.pidfd_send_signal(pidfd, signal.SIGTERM)
+            else:
+                proc.terminate()
+        except (AttributeError, ProcessLookupError):
+            proc.terminate()
+        proc.wait()
+    
+    def _set_char_table(self, table: List[Optional[Tuple[int, bool]]]):
+        """Install the ASCII (code, needs_shift) table and its packed form"""
+        self._char_table = table
+        codes, shifts = bytearray(256), bytearray(256)
+        for o, entry in enumerate(table):
+            if entry and entry[0] < 256:
+                codes[o], shifts[o] = entry[0], entry[1]
+        self._plan_codes, self._plan_shifts = bytes(codes), bytes(shifts)
+    
+    def plan(self, text: str) -> Tuple[bytes, bytes]:
+        """Resolve text to parallel key code and Shift flag bytes (code 0 = unmapped)"""
+        # Both passes run in C, one byte per keystroke in each array
+        raw = text.encode('ascii', 'linuxclickpaste.unmapped')
+        return raw.translate(self._plan_codes), raw.translate(self._plan_shifts)
+    
+    # Below this much waiting sleeping is too coarse, so spin instead (ns)
+    SPIN_THRESHOLD_NS = 2_000_000
+    # How early to wake from a sleep and spin the remainder (ns)
+    SPIN_TAIL_NS = 500_000
+    
+    def _paced_iter(self, items, delay: float):
+        """Yield items on a fixed schedule of one every delay seconds"""
+        # Integer nanoseconds keep the absolute schedule free of float drift
+        clock = time.perf_counter_ns
+        delay_ns = int(delay * 1e9)
+        deadline = clock()
+        for item in items:
+            # Time spent emitting the item counts towards its delay
+            deadline += delay_ns
+            yield item
+            
+            remaining = deadline - clock()
+            if remaining < -delay_ns:
+                # Far behind (e.g. a stall); resync instead of bursting
+                deadline = clock()
+                continue
+            if remaining >= self.SPIN_THRESHOLD_NS:
+                # Wake slightly early and spin the rest to absorb timer
+                # slack; the caller sees a cancel before the next item
+                ready, _, _ = select.select([self._cancel_r], [], [],
+                                            (remaining - self.SPIN_TAIL_NS) / 1e9)
+                if ready:
+                    continue
+            while clock() < deadline:
+                pass
+
+class NativeXTest:
+    """Direct libXtst bindings, skipping python-xlib request marshalling"""
+    
+    def __init__(self):
+        x11 = ctypes.CDLL(ctypes.util.find_library('X11') or 'libX11.so.6')
+        xtst = ctypes.CDLL(ctypes.util.find_library('Xtst') or 'libXtst.so.6')
+        
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XFlush.argtypes = [ctypes.c_void_p]
+        x11.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        xtst.XTestFakeKeyEvent.argtypes = [
+            ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong
+        ]
+        
+        self._dpy = x11.XOpenDisplay(None)
+        if not self._dpy:
+            raise OSError("XOpenDisplay failed")
+        self._x11 = x11
+        self._fake_key = xtst.XTestFakeKeyEvent
+    
+    @classmethod
+    def open(cls) -> Optional['NativeXTest']:
+        """Return a native connection, or None if libX11/libXtst are missing"""
+        try:
+            return cls()
+        except (OSError, AttributeError) as e:
+            logger.debug(f"Native XTest unavailable: {e}")
+            return None
+    
+    def emit(self, keycode: int, with_shift: bool, shift_keycode: int,
+             hold: float = 0.0):
+        """Press and release a keycode, optionally wrapped in Shift"""
+        dpy, fake = self._dpy, self._fake_key
+        if with_shift:
+            fake(dpy, shift_keycode, True, 0)
+        fake(dpy, keycode, True, 0)
+        if hold:
+            self._x11.XFlush(dpy)
+            time.sleep(hold)
+        fake(dpy, keycode, False, 0)
+        if with_shift:
+            fake(dpy, shift_keycode, False, 0)
+            # Let clients see Shift released before the next character
+            self._x11.XSync(dpy, False)
+        else:
+            self._x11.XFlush(dpy)
+    
+    def sync(self):
+        """Wait for the X server to process queued events"""
+        self._x11.XSync(self._dpy, False)
+    
+    def close(self):
+        """Close the connection; safe to call more than once"""
+        if self._dpy:
+            self._x11.XCloseDisplay(self._dpy)
+            self._dpy = None
 
 class XTestInputSimulator(InputSimulator):
     """X11 input simulation using XTest extension (like Windows SendKeys)"""
     
-    def __init__(self):
+    # Characters typed between blocking round-trips to the X server
+    SYNC_INTERVAL = 64
+    
+    def __init__(self, display_provider: Optional[Callable] = None):
         super().__init__()
-        if not XLIB_AVAILABLE:
+        if not xlib_available():
             raise ImportError("python-xlib is required for XTest input")
+        # The connection itself is opened lazily, so check now that there is
+        # a server to open it to and let the caller fall back otherwise
+        if not x_display_reachable():
+            raise ImportError("No reachable X display for XTest input")
         
-        self.display = XDisplay.Display()
-        self.root = self.display.screen().root
+        # python-xlib is imported and the X connection obtained on first
+        # use; the connection is shared with the caller when a provider is given
+        self._display_provider = display_provider
+        self._display = None
+        self._native: Optional[NativeXTest] = None
         
         # Special characters that need escaping (like Windows SendKeys)
         self.special_chars = "{}[]+^%~()"
+        self._escaped = {c: '{' + c + '}' for c in self.special_chars}
         
         # Shift character mappings
         self.shift_chars = {
@@ -175,175 +526,373 @@ class XTestInputSimulator(InputSimulator):
         for c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
             self.shift_chars[c] = c.lower()
     
-    def prepare_keystrokes(self, text: str) -> List[str]:
+    @property
+    def display(self):
+        """X connection, opened with keycodes resolved on first access"""
+        return self._ensure_display()
+    
+    def _ensure_display(self):
+        """Open the X connection and resolve keycodes if not done yet"""
+        if self._display is None:
+            self._X, self._XK, self._xtest, XDisplay = _xlib_loader()
+            self._display = (self._display_provider or XDisplay.Display)()
+            self._resolve_keycodes()
+        return self._display
+    
+    def _resolve_keycodes(self):
+        """Resolve keycodes once so typing does not repeat keysym lookups"""
+        self._shift_keycode = self.display.keysym_to_keycode(self._XK.XK_Shift_L)
+        
+        # Key name -> keycode (0 if unmapped); keymap changes mid-session
+        # are rare, so entries are never invalidated
+        self._keycode_cache: Dict[str, int] = {}
+        self._char_map: Dict[str, Tuple[int, bool]] = {}
+        for char in string.printable:
+            key, with_shift = self._key_for_char(char)
+            keycode = self._keycode(key)
+            if keycode != 0:
+                self._char_map[char] = (keycode, with_shift)
+        
+        # Emit through libXtst directly when available, on its own native
+        # connection, with the emitter specialized for whichever is used
+        self._native = NativeXTest.open()
+        self._emit = self._build_emitter()
+        
+        # ASCII lookup table indexed by ord() for the typing hot path
+        table: List[Optional[Tuple[int, bool]]] = [None] * 128
+        for char, entry in self._char_map.items():
+            if ord(char) < 128:
+                table[ord(char)] = entry
+        self._set_char_table(table)
+    
+    def prepare_keystrokes(self, text: str) -> Iterator[str]:
         """Prepare keystrokes like Windows version"""
-        keystrokes = []
+        # Escape special characters by wrapping in braces; the escapes are
+        # prebuilt, so nothing is allocated per character
+        escaped = self._escaped
         for char in text:
-            if char in self.special_chars:
-                # Escape special characters by wrapping in braces
-                keystrokes.append(f"{{{char}}}")
-            else:
-                keystrokes.append(char)
-        return keystrokes
+            yield escaped.get(char, char)
     
     def type_text(self, text: str, delay_ms: int) -> bool:
         """Type text with specified delay"""
-        self.cancel_token.clear()
-        keystrokes = self.prepare_keystrokes(text)
+        self._ensure_display()
+        text = text.translate(self.NORMALIZE_TABLE)
         
-        for keystroke in keystrokes:
-            if self.cancel_token.is_set():
+        # Translate the whole text up front; unmapped chars take the slow path
+        codes, shifts = self.plan(text)
+        
+        # The X server needs no gap between press and release
+        hold = self.keydown_hold_ms / 1000.0
+        
+        # Bound to locals so the loop does no attribute lookups
+        emit, type_char, sync = self._emit, self._type_char, self._sync
+        cancelled, interval = self.cancel_token.is_set, self.SYNC_INTERVAL
+        
+        # Characters flushed since the last round-trip
+        unsynced = 0
+        keys = zip(text, codes, shifts)
+        for char, keycode, with_shift in self._paced_iter(keys, delay_ms / 1000.0):
+            if cancelled():
+                sync()
                 return False
             
-            # Handle escaped characters
-            if keystroke.startswith('{') and keystroke.endswith('}'):
-                char = keystroke[1:-1]
+            if keycode:
+                emit(keycode, with_shift, hold)
+                if with_shift:
+                    # Shifted characters already end with a sync
+                    unsynced = 0
+                    continue
             else:
-                char = keystroke
+                type_char(char, hold)
             
-            self._type_char(char)
-            time.sleep(delay_ms / 1000.0)
+            # Unshifted runs are only flushed; wait for the server to
+            # catch up every so often
+            unsynced += 1
+            if unsynced >= interval:
+                sync()
+                unsynced = 0
         
+        sync()
         return True
     
-    def _type_char(self, char: str):
-        """Type a single character"""
+    def _key_for_char(self, char: str) -> Tuple[str, bool]:
+        """Map a character to its key name and whether Shift is needed"""
         if char == '\n':
-            self._press_key('Return')
+            return 'Return', False
         elif char == '\t':
-            self._press_key('Tab')
+            return 'Tab', False
         elif char == ' ':
-            self._press_key('space')
+            return 'space', False
         elif char in self.shift_chars:
-            self._press_key(self.shift_chars[char], with_shift=True)
+            return self.shift_chars[char], True
+        return char, False
+    
+    def _type_char(self, char: str, hold: float = 0.0):
+        """Type a single character, holding the key down for hold seconds"""
+        o = ord(char)
+        entry = self._char_table[o] if o < 128 else None
+        if entry:
+            self._emit(*entry, hold)
         else:
-            self._press_key(char)
+            self._press_key(*self._key_for_char(char), hold)
+    
+    def _keycode(self, key: str) -> int:
+        """Resolve a key name to a keycode through the cache"""
+        keycode = self._keycode_cache.get(key)
+        if keycode is None:
+            keysym = _ASCII_KEYSYMS.get(key) or self._XK.string_to_keysym(key)
+            keycode = self.display.keysym_to_keycode(keysym) if keysym else 0
+            self._keycode_cache[key] = keycode
+        return keycode
     
-    def _press_key(self, key: str, with_shift: bool = False):
+    def _press_key(self, key: str, with_shift: bool = False, hold: float = 0.0):
         """Simulate a key press"""
-        keysym = XK.string_to_keysym(key)
-        if keysym == 0:
-            return
-        
-        keycode = self.display.keysym_to_keycode(keysym)
+        keycode = self._keycode(key)
         if keycode == 0:
             return
         
-        if with_shift:
-            shift_keycode = self.display.keysym_to_keycode(XK.XK_Shift_L)
-            xtest.fake_input(self.display, X.KeyPress, shift_keycode)
-            self.display.sync()
+        self._emit(keycode, with_shift, hold)
+    
+    def _build_emitter(self) -> Callable[..., None]:
+        """Build _emit(keycode, with_shift, hold=0.0) for the resolved connection"""
+        shift_keycode = self._shift_keycode
         
-        xtest.fake_input(self.display, X.KeyPress, keycode)
-        self.display.sync()
-        time.sleep(0.001)
-        xtest.fake_input(self.display, X.KeyRelease, keycode)
-        self.display.sync()
+        if self._native:
+            native_emit = self._native.emit
+            
+            def emit(keycode: int, with_shift: bool, hold: float = 0.0):
+                native_emit(keycode, with_shift, shift_keycode, hold)
+            return emit
         
-        if with_shift:
-            xtest.fake_input(self.display, X.KeyRelease, shift_keycode)
-            self.display.sync()
+        # Everything the python-xlib path needs is closed over, so sending
+        # a key does no attribute lookups
+        display, fake_input = self._display, self._xtest.fake_input
+        press, release = self._X.KeyPress, self._X.KeyRelease
+        flush, sync, sleep = display.flush, display.sync, time.sleep
+        
+        def emit(keycode: int, with_shift: bool, hold: float = 0.0):
+            if with_shift:
+                fake_input(display, press, shift_keycode)
+            
+            fake_input(display, press, keycode)
+            if hold:
+                flush()
+                sleep(hold)
+            fake_input(display, release, keycode)
+            
+            if with_shift:
+                fake_input(display, release, shift_keycode)
+                # Let clients see Shift released before the next character
+                sync()
+            else:
+                flush()
+        return emit
+    
+    def close(self):
+        """Close the native libXtst connection, if one was opened"""
+        if self._native:
+            self._native.close()
+            self._native = None
+    
+    def _sync(self):
+        """Round-trip with the X server on whichever connection emits keys"""
+        if self._native:
+            self._native.sync()
+        else:
+            self._display.sync()
 
 class XDoToolInputSimulator(InputSimulator):
     """Input simulation using xdotool (works on X11 and XWayland)"""
     
     def __init__(self):
         super().__init__()
-        # Check if xdotool is available
-        try:
-            subprocess.run(['xdotool', '--version'], capture_output=True, check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        # Check if xdotool is available, keeping its path so each paste
+        # execs it directly instead of searching PATH
+        path = shutil.which('xdotool')
+        if path is None:
             raise ImportError("xdotool is required for this input method")
+        self._argv = (path, 'type', '--delay')
     
     def prepare_keystrokes(self, text: str) -> List[str]:
         """For xdotool, we send the whole text"""
         return [text]
     
     def type_text(self, text: str, delay_ms: int) -> bool:
-        """Type text using xdotool"""
-        self.cancel_token.clear()
-        
-        try:
-            # xdotool type command with delay
-            proc = subprocess.Popen([
-                'xdotool', 'type', '--delay', str(delay_ms), text
-            ])
-            
-            # Wait for completion or cancellation
-            while proc.poll() is None:
-                if self.cancel_token.is_set():
-                    proc.terminate()
-                    return False
-                time.sleep(0.1)
-            
-            return proc.returncode == 0
-        except Exception as e:
-            logger.error(f"xdotool error: {e}")
-            return False
+        """Type text using xdotool (one process per paste)"""
+        return self._run_helper(self._argv + (str(delay_ms), '--file', '-'), text,
+                                stdout=subprocess.DEVNULL)
 
 class YDoToolInputSimulator(InputSimulator):
     """Input simulation using ydotool (works on both X11 and Wayland)"""
     
     def __init__(self):
         super().__init__()
-        # Check if ydotool is available and daemon is running
-        try:
-            result = subprocess.run(['ydotool', 'type', ''], capture_output=True, text=True)
-            if 'ydotoold backend unavailable' in result.stderr:
-                raise ImportError("ydotoold daemon not running. Start with: systemctl --user start ydotoold")
-        except FileNotFoundError:
+        # Check if ydotool is available and daemon is running, without
+        # spawning ydotool itself
+        path = shutil.which('ydotool')
+        if path is None:
             raise ImportError("ydotool not installed")
+        self._argv = (path, 'type', '--key-delay')
+        if not self._daemon_running():
+            raise ImportError("ydotoold daemon not running. Start with: systemctl --user start ydotoold")
+    
+    @staticmethod
+    def _daemon_running() -> bool:
+        """Check that ydotoold's socket exists and accepts connections"""
+        candidates = [os.environ.get('YDOTOOL_SOCKET')]
+        if os.environ.get('XDG_RUNTIME_DIR'):
+            candidates.append(os.path.join(os.environ['XDG_RUNTIME_DIR'], '.ydotool_socket'))
+        candidates.append('/tmp/.ydotool_socket')
+        
+        for path in filter(None, candidates):
+            if not os.path.exists(path):
+                continue
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            try:
+                sock.settimeout(0.05)
+                sock.connect(path)
+                return True
+            except ConnectionRefusedError:
+                continue  # Stale socket left by a dead daemon
+            except OSError:
+                return True  # Socket is there but not the type we probed with
+            finally:
+                sock.close()
+        return False
     
     def prepare_keystrokes(self, text: str) -> List[str]:
-        """For ydotool, we send the whole text"""
+        """For ydotool, we send the whole text (only XTest escapes per char)"""
         return [text]
     
     def type_text(self, text: str, delay_ms: int) -> bool:
         """Type text using ydotool"""
-        self.cancel_token.clear()
+        return self._run_helper(self._argv + (str(delay_ms), '--file', '-'), text)
+
+class UInputInputSimulator(InputSimulator):
+    """Input simulation through a virtual uinput keyboard (like dotool)"""
+    
+    # Unshifted characters and their evdev key names (US layout)
+    KEY_NAMES = {
+        '\n': 'KEY_ENTER', '\t': 'KEY_TAB', ' ': 'KEY_SPACE',
+        '-': 'KEY_MINUS', '=': 'KEY_EQUAL', '[': 'KEY_LEFTBRACE',
+        ']': 'KEY_RIGHTBRACE', '\\': 'KEY_BACKSLASH', ';': 'KEY_SEMICOLON',
+        "'": 'KEY_APOSTROPHE', '`': 'KEY_GRAVE', ',': 'KEY_COMMA',
+        '.': 'KEY_DOT', '/': 'KEY_SLASH'
+    }
+    
+    # Shifted characters and the unshifted character on the same key
+    SHIFTED = {
+        '!': '1', '@': '2', '#': '3', '$': '4', '%': '5',
+        '^': '6', '&': '7', '*': '8', '(': '9', ')': '0',
+        '_': '-', '+': '=', '{': '[', '}': ']', '|': '\\',
+        ':': ';', '"': "'", '<': ',', '>': '.', '?': '/', '~': '`'
+    }
+    
+    def __init__(self):
+        super().__init__()
+        if not EVDEV_AVAILABLE:
+            raise ImportError("python-evdev is required for uinput input")
+        if not os.access('/dev/uinput', os.W_OK):
+            raise ImportError("/dev/uinput is not writable (see README for permissions)")
         
-        try:
-            # ydotool type command with delay
-            proc = subprocess.Popen([
-                'ydotool', 'type', '--key-delay', str(delay_ms), text
-            ])
-            
-            # Wait for completion or cancellation
-            while proc.poll() is None:
-                if self.cancel_token.is_set():
-                    proc.terminate()
-                    return False
-                time.sleep(0.1)
+        key_names = dict(self.KEY_NAMES)
+        for c in 'abcdefghijklmnopqrstuvwxyz0123456789':
+            key_names[c] = f'KEY_{c.upper()}'
+        
+        # ASCII table of (key code, needs_shift), built once
+        table: List[Optional[Tuple[int, bool]]] = [None] * 128
+        for char, name in key_names.items():
+            table[ord(char)] = (ecodes.ecodes[name], False)
+        for char, base in self.SHIFTED.items():
+            table[ord(char)] = (ecodes.ecodes[key_names[base]], True)
+        for c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
+            table[ord(c)] = (ecodes.ecodes[key_names[c.lower()]], True)
+        self._set_char_table(table)
+        
+        self._shift_code = ecodes.KEY_LEFTSHIFT
+        codes = {code for code, _ in filter(None, table)}
+        codes.add(self._shift_code)
+        
+        # Created up front so the compositor has picked it up by the first paste
+        self.device = UInput({ecodes.EV_KEY: sorted(codes)}, name='linuxclickpaste')
+    
+    def close(self):
+        """Remove the virtual keyboard"""
+        self.device.close()
+    
+    def prepare_keystrokes(self, text: str) -> List[str]:
+        """Keystrokes are resolved per character from the key table"""
+        return list(text)
+    
+    def type_text(self, text: str, delay_ms: int) -> bool:
+        """Type text through the virtual keyboard"""
+        text = text.translate(self.NORMALIZE_TABLE)
+        
+        codes, shifts = self.plan(text)
+        keys = zip(codes, shifts)
+        skipped = codes.count(0)
+        if skipped:
+            logger.warning(f"uinput: skipped {skipped} characters not on a US keyboard")
+            keys = [key for key in keys if key[0]]
+        
+        hold = self.keydown_hold_ms / 1000.0
+        write, syn = self.device.write, self.device.syn
+        EV_KEY, shift = ecodes.EV_KEY, self._shift_code
+        
+        for code, with_shift in self._paced_iter(keys, delay_ms / 1000.0):
+            if self.cancel_token.is_set():
+                return False
             
-            return proc.returncode == 0
-        except Exception as e:
-            logger.error(f"ydotool error: {e}")
-            return False
+            if with_shift:
+                write(EV_KEY, shift, 1)
+            write(EV_KEY, code, 1)
+            syn()
+            if hold:
+                time.sleep(hold)
+            write(EV_KEY, code, 0)
+            if with_shift:
+                write(EV_KEY, shift, 0)
+            syn()
+        
+        return True
 
 class CursorManager:
     """Manages cursor changes like the Windows version"""
     
-    def __init__(self, display):
-        self.display = display
+    def __init__(self, display_provider: Callable):
+        self._display_provider = display_provider
         self.original_cursors = {}
         self.cursor_font = None
-        
-    def set_crosshair_cursor(self):
-        """Change cursors to crosshair (like Windows version)"""
-        try:
+        self._crosshair_cursor = None
+        # Whether the root cursor is currently the crosshair
+        self._cursor_changed = False
+    
+    @property
+    def display(self):
+        """X connection, obtained from the provider on first use"""
+        return self._display_provider()
+    
+    def _crosshair(self):
+        """Crosshair cursor, created once and reused for every selection"""
+        if self._crosshair_cursor is None:
             # Load cursor font
-            self.cursor_font = self.display.core.open_font('cursor')
+            self.cursor_font = self.display.open_font('cursor')
             
             # Create crosshair cursor
-            crosshair = self.cursor_font.create_glyph_cursor(
+            self._crosshair_cursor = self.cursor_font.create_glyph_cursor(
                 self.cursor_font,
                 CursorType.CROSS, CursorType.CROSS + 1,
                 (65535, 65535, 65535), (0, 0, 0)
             )
-            
-            # Change root window cursor
-            self.display.screen().root.change_attributes(cursor=crosshair)
-            self.display.sync()
+        return self._crosshair_cursor
+    
+    def set_crosshair_cursor(self):
+        """Change cursors to crosshair (like Windows version)"""
+        try:
+            # Change root window cursor; no reply is needed, so just flush
+            self.display.screen().root.change_attributes(cursor=self._crosshair())
+            self.display.flush()
+            self._cursor_changed = True
             
             return True
         except Exception as e:
@@ -352,48 +901,151 @@ class CursorManager:
     
     def restore_cursor(self):
         """Restore original cursors"""
+        # Nothing was changed, so do not open the connection just to reset
+        if not self._cursor_changed:
+            return
         try:
             # Reset to default cursor
             self.display.screen().root.change_attributes(cursor=0)
-            self.display.sync()
+            self.display.flush()
+            self._cursor_changed = False
+        except Exception as e:
+            logger.error(f"Failed to restore cursor: {e}")
+    
+    def grab_input(self) -> bool:
+        """Grab pointer and keyboard on the root window for target selection"""
+        X = _xlib_loader()[0]
+        try:
+            root = self.display.screen().root
+            status = root.grab_pointer(
+                False, X.ButtonPressMask | X.ButtonReleaseMask,
+                X.GrabModeAsync, X.GrabModeAsync,
+                X.NONE, self._crosshair(), X.CurrentTime
+            )
+            if status != X.GrabSuccess:
+                return False
             
+            status = root.grab_keyboard(
+                False, X.GrabModeAsync, X.GrabModeAsync, X.CurrentTime
+            )
+            if status != X.GrabSuccess:
+                self.display.ungrab_pointer(X.CurrentTime)
+                self.display.flush()
+                return False
+            
+            return True
+        except Exception as e:
+            logger.debug(f"Failed to grab input: {e}")
+            return False
+    
+    def ungrab_input(self):
+        """Release the grabs taken by grab_input"""
+        X = _xlib_loader()[0]
+        try:
+            self.display.ungrab_pointer(X.CurrentTime)
+            self.display.ungrab_keyboard(X.CurrentTime)
+            self.display.flush()
+        except Exception as e:
+            logger.error(f"Failed to release input grab: {e}")
+    
+    def close(self):
+        """Free the crosshair cursor and cursor font at shutdown"""
+        # Nothing was allocated, so the connection may never have been opened
+        if self._crosshair_cursor is None and self.cursor_font is None:
+            return
+        try:
+            if self._crosshair_cursor:
+                self._crosshair_cursor.free()
+                self._crosshair_cursor = None
             if self.cursor_font:
                 self.cursor_font.close()
                 self.cursor_font = None
+            self.display.flush()
         except Exception as e:
-            logger.error(f"Failed to restore cursor: {e}")
+            logger.error(f"Failed to free cursor: {e}")
 
 class ClickPasteApp:
+    # Seconds a prefetched clipboard read stays valid
+    CLIPBOARD_TTL = 2.0
+    
     def __init__(self):
         self.app = Gtk.Application(application_id='com.github.linuxclickpaste')
         self.app.connect('activate', self.on_activate)
         
-        # Initialize early
-        if XLIB_AVAILABLE:
-            self.x_display = XDisplay.Display()
-            self.cursor_manager = CursorManager(self.x_display)
+        # One python-xlib connection shared by the cursor manager, focus and
+        # modifier queries and XTest, opened on first use. XTest typing
+        # through libXtst opens a second, native connection of its own.
+        self.x_display = None
+        self._x_display_lock = threading.Lock()
+        
+        # Cursor, grab, focus and modifier handling only in X sessions, so
+        # a Wayland session does not connect to (and wake) XWayland per paste
+        x_session = (os.environ.get('XDG_SESSION_TYPE') != 'wayland' and
+                     xlib_available() and x_display_reachable())
+        if x_session:
+            self.cursor_manager = CursorManager(self._get_x_display)
         else:
-            self.x_display = None
             self.cursor_manager = None
         
         # Paths
         self.config_dir = Path.home() / '.config' / 'linuxclickpaste'
         self.settings_path = self.config_dir / 'settings.json'
         
+        # Fallback notifier, resolved once so spawning skips the PATH search
+        notify_send = shutil.which('notify-send')
+        self._notify_argv = (notify_send, '--app-name=LinuxClickPaste',
+                             '--icon=edit-paste') if notify_send else None
+        self._notification_server = False
+        
         # Load settings
         self.settings = Settings.load(self.settings_path)
         
         # State
         self.selecting_target = False
         self.overlay_window = None
+        self._paste_on_unmap = False
+        self._confirming = False
+        self._grab_watch = 0
+        self._escape_keycode = None
         self.typing_active = False
         self.input_simulator = None
+        self.settings_window = None
         self.settings_window_open = False
+        self._save_source = 0
+        self._mod_mask = None
         self.original_icon = None
+        self._dark_theme = None
         self.indicator = None
         self.fallback_window = None
+        self._display = None
+        self._clipboard = None
+        self._cached_clipboard_text = None
+        self._cached_clipboard_time = 0.0
+        # Bumped on every prefetch, paste and clipboard change; a read only
+        # counts if it belongs to the current generation
+        self._clipboard_generation = 0
+        self._cached_clipboard_generation = -1
+        
+        # Worker-to-UI calls share one pipe watched by the main loop, so
+        # posting one allocates no GSource
+        self._ui_calls = queue.SimpleQueue()
+        self._ui_wake_r, self._ui_wake_w = os.pipe()
+        os.set_blocking(self._ui_wake_r, False)
+        os.set_blocking(self._ui_wake_w, False)
+        self._ui_watch = GLib.unix_fd_add_full(
+            GLib.PRIORITY_DEFAULT_IDLE, self._ui_wake_r, GLib.IOCondition.IN,
+            self._dispatch_ui_calls
+        )
+        self._shutting_down = False
         
-        # Initialize Keybinder for global hotkeys if available
+        # Typing happens on one long-lived worker fed through a queue
+        self._paste_queue = queue.SimpleQueue()
+        self._worker_idle = threading.Event()
+        threading.Thread(target=self._paste_worker, daemon=True).start()
+        
+        # Initialize Keybinder for global hotkeys if available; a failure
+        # turns hotkeys off for the whole module
+        global KEYBINDER_AVAILABLE
         if KEYBINDER_AVAILABLE:
             try:
                 Keybinder.init()
@@ -416,17 +1068,33 @@ class ClickPasteApp:
             # Create a fallback window if no tray support
             self.create_fallback_window()
         
-        # Create settings window
-        self.create_settings_window()
+        # Display and clipboard live as long as the process
+        self._display = Gdk.Display.get_default()
+        self._clipboard = self._display.get_clipboard()
+        self._clipboard.connect("changed", self._invalidate_clipboard_cache)
         
         # Register hotkey if available
         if KEYBINDER_AVAILABLE:
             self.start_hotkey()
         
         # Show ready notification
-        if self.settings.show_notifications:
-            self.show_notification("LinuxClickPaste Started", 
-                                 "Ready to paste. Click tray icon or use window.")
+        self.show_notification("LinuxClickPaste Started", 
+                             "Ready to paste. Click tray icon or use window.")
+    
+    def _get_x_display(self):
+        """Return the shared X connection, opening it if needed
+        
+        The GTK thread (cursor, grab events) and the typing worker (XTest,
+        keymap and focus queries) share this one connection. That is safe
+        because python-xlib serializes requests and replies on a display
+        with its own internal locks (enabled by _xlib_loader importing
+        Xlib.threaded); only creating it needs a lock here.
+        """
+        if self.x_display is None:
+            with self._x_display_lock:
+                if self.x_display is None:
+                    self.x_display = _xlib_loader()[3].Display()
+        return self.x_display
     
     def create_fallback_window(self):
         """Create a minimal window when tray is not available"""
@@ -447,6 +1115,10 @@ class ClickPasteApp:
         paste_button.connect("clicked", lambda w: self.start_track())
         box.append(paste_button)
         
+        cancel_button = Gtk.Button(label="Cancel Paste")
+        cancel_button.connect("clicked", lambda w: self._cancel_typing())
+        box.append(cancel_button)
+        
         settings_button = Gtk.Button(label="Settings")
         settings_button.connect("clicked", self.on_settings_click)
         box.append(settings_button)
@@ -456,17 +1128,24 @@ class ClickPasteApp:
     
     def _create_input_simulator(self):
         """Create appropriate input simulator"""
+        # Release the previous backend first, e.g. so switching away from
+        # uinput does not leave its virtual keyboard behind
+        if self.input_simulator:
+            self.input_simulator.close()
+            self.input_simulator = None
         try:
             if self.settings.type_method == TypeMethod.YDOTOOL:
                 self.input_simulator = YDoToolInputSimulator()
             elif self.settings.type_method == TypeMethod.XDOTOOL:
                 self.input_simulator = XDoToolInputSimulator()
+            elif self.settings.type_method == TypeMethod.UINPUT:
+                self.input_simulator = UInputInputSimulator()
             else:
-                self.input_simulator = XTestInputSimulator()
+                self.input_simulator = XTestInputSimulator(self._get_x_display)
         except Exception as e:
             logger.warning(f"Failed to create {self.settings.type_method.value} simulator: {e}")
             # Try fallbacks
-            fallbacks = [TypeMethod.XDOTOOL, TypeMethod.YDOTOOL, TypeMethod.XTEST]
+            fallbacks = [TypeMethod.XDOTOOL, TypeMethod.YDOTOOL, TypeMethod.UINPUT, TypeMethod.XTEST]
             for method in fallbacks:
                 if method != self.settings.type_method:
                     try:
@@ -474,10 +1153,13 @@ class ClickPasteApp:
                             self.input_simulator = YDoToolInputSimulator()
                         elif method == TypeMethod.XDOTOOL:
                             self.input_simulator = XDoToolInputSimulator()
+                        elif method == TypeMethod.UINPUT:
+                            self.input_simulator = UInputInputSimulator()
                         else:
-                            self.input_simulator = XTestInputSimulator()
+                            self.input_simulator = XTestInputSimulator(self._get_x_display)
                         logger.info(f"Fell back to {method.value}")
                         self.settings.type_method = method
+                        self.settings.mark_dirty()
                         return
                     except:
                         continue
@@ -490,23 +1172,41 @@ class ClickPasteApp:
             dark_theme = self._is_dark_theme()
             icon_name = "edit-paste"
             
-            self.indicator = AppIndicator3.Indicator.new(
+            self.indicator = AppIndicator.Indicator.new(
                 "linuxclickpaste",
                 icon_name,
-                AppIndicator3.IndicatorCategory.APPLICATION_STATUS
+                AppIndicator.IndicatorCategory.APPLICATION_STATUS
             )
             
-            self.indicator.set_status(AppIndicator3.IndicatorStatus.ACTIVE)
-            self.indicator.set_menu(self.create_menu())
+            menu, actions = self.create_menu()
+            self.indicator.set_menu(menu)
+            self.indicator.set_actions(actions)
+            self.indicator.set_status(AppIndicator.IndicatorStatus.ACTIVE)
             
             # Store original icon
             self.original_icon = icon_name
+            
+            # No window is open, so keep the application running
+            self.app.hold()
         except Exception as e:
             logger.error(f"Failed to create indicator: {e}")
+            self.indicator = None
             self.create_fallback_window()
     
     def _is_dark_theme(self):
         """Detect if using dark theme"""
+        if self._dark_theme is None:
+            # Read once, then keep the cache current on theme changes
+            self._dark_theme = self._read_dark_theme()
+            try:
+                Gtk.Settings.get_default().connect("notify::gtk-theme-name",
+                                                   self._on_theme_changed)
+            except Exception as e:
+                logger.debug(f"Cannot watch theme changes: {e}")
+        return self._dark_theme
+    
+    def _read_dark_theme(self):
+        """Query the GTK theme name for a dark variant"""
         try:
             # Try to detect GTK theme
             settings = Gtk.Settings.get_default()
@@ -515,34 +1215,34 @@ class ClickPasteApp:
         except:
             return True
     
-    def create_menu(self):
-        """Create tray menu - using GTK3 menu for AppIndicator3"""
-        # Import GTK3 for menu (AppIndicator3 requires it)
-        gi_menu = gi.require_version('Gtk', '3.0')
-        from gi.repository import Gtk as Gtk3
-        
-        menu = Gtk3.Menu()
-        
-        # Click to paste
-        item_paste = Gtk3.MenuItem(label="Click to Paste")
-        item_paste.connect("activate", lambda w: self.start_track())
-        menu.append(item_paste)
-        
-        # Settings item
-        item_settings = Gtk3.MenuItem(label="Settings")
-        item_settings.connect("activate", self.on_settings_click)
-        menu.append(item_settings)
-        
-        # Separator
-        menu.append(Gtk3.SeparatorMenuItem())
+    def _on_theme_changed(self, settings, pspec):
+        """Refresh the cached dark theme flag"""
+        self._dark_theme = self._read_dark_theme()
+    
+    def create_menu(self) -> Tuple[Gio.Menu, Gio.SimpleActionGroup]:
+        """Create tray menu and the actions its items trigger"""
+        actions = Gio.SimpleActionGroup()
+        for name, callback in (("paste", lambda a, p: self.start_track()),
+                               ("cancel", lambda a, p: self._cancel_typing()),
+                               ("settings", lambda a, p: self.on_settings_click(None)),
+                               ("exit", lambda a, p: self.on_exit(None))):
+            action = Gio.SimpleAction.new(name, None)
+            action.connect("activate", callback)
+            actions.add_action(action)
         
-        # Exit
-        item_exit = Gtk3.MenuItem(label="Exit")
-        item_exit.connect("activate", self.on_exit)
-        menu.append(item_exit)
+        # The indicator exports actions under the "indicator" prefix
+        menu = Gio.Menu()
+        main = Gio.Menu()
+        main.append("Click to Paste", "indicator.paste")
+        main.append("Cancel Paste", "indicator.cancel")
+        main.append("Settings", "indicator.settings")
+        menu.append_section(None, main)
         
-        menu.show_all()
-        return menu
+        # Exit in its own section, shown below a separator
+        end = Gio.Menu()
+        end.append("Exit", "indicator.exit")
+        menu.append_section(None, end)
+        return menu, actions
     
     def create_settings_window(self):
         """Create settings window matching Windows version"""
@@ -615,14 +1315,17 @@ class ClickPasteApp:
         self.method_combo.append_text("XTest (SendKeys equivalent)")
         self.method_combo.append_text("xdotool (AutoIt equivalent)")
         self.method_combo.append_text("ydotool (Wayland compatible)")
+        self.method_combo.append_text("uinput (kernel, X11 and Wayland)")
         
         # Set active based on current method
         if self.settings.type_method == TypeMethod.XTEST:
             self.method_combo.set_active(0)
         elif self.settings.type_method == TypeMethod.XDOTOOL:
             self.method_combo.set_active(1)
-        else:
+        elif self.settings.type_method == TypeMethod.YDOTOOL:
             self.method_combo.set_active(2)
+        else:
+            self.method_combo.set_active(3)
         
         self.method_combo.connect("changed", self.on_method_changed)
         method_box.append(self.method_combo)
@@ -640,26 +1343,67 @@ class ClickPasteApp:
     def on_key_delay_changed(self, spin):
         """Handle key delay change"""
         self.settings.key_delay_ms = int(spin.get_value())
+        self.settings.mark_dirty()
+        self._schedule_save()
     
     def on_method_changed(self, combo):
         """Handle type method change"""
+        # The worker holds the current simulator until its paste finishes,
+        # so switch only between pastes and put the combo back otherwise
+        if self.typing_active:
+            logger.info("Not changing the typing method while a paste is in progress")
+            self.show_notification("Paste In Progress",
+                                 "Change the typing method once typing has finished")
+            combo.handler_block_by_func(self.on_method_changed)
+            # Combo entries follow TypeMethod's declaration order
+            combo.set_active(list(TypeMethod).index(self.settings.type_method))
+            combo.handler_unblock_by_func(self.on_method_changed)
+            return
         active = combo.get_active()
         if active == 0:
             self.settings.type_method = TypeMethod.XTEST
         elif active == 1:
             self.settings.type_method = TypeMethod.XDOTOOL
-        else:
+        elif active == 2:
             self.settings.type_method = TypeMethod.YDOTOOL
+        else:
+            self.settings.type_method = TypeMethod.UINPUT
+        self.settings.mark_dirty()
+        self._schedule_save()
         self._create_input_simulator()
     
+    # Quiet period before changed settings are written to disk
+    SAVE_DEBOUNCE_MS = 250
+    
+    def _schedule_save(self):
+        """Save settings once the user stops changing them"""
+        if self._save_source:
+            GLib.source_remove(self._save_source)
+        self._save_source = GLib.timeout_add(self.SAVE_DEBOUNCE_MS, self._on_save_timeout)
+    
+    def _on_save_timeout(self):
+        """Debounce period elapsed"""
+        self._save_source = 0
+        self.settings.save(self.settings_path)
+        return False
+    
+    def _do_save(self):
+        """Write pending settings changes now"""
+        if self._save_source:
+            GLib.source_remove(self._save_source)
+            self._save_source = 0
+        self.settings.save(self.settings_path)
+    
     def on_save_settings(self, button):
         """Save settings"""
-        self.settings.save(self.settings_path)
-        if self.settings.show_notifications:
-            self.show_notification("Settings Saved", "Your settings have been saved")
+        self._do_save()
+        self.show_notification("Settings Saved", "Your settings have been saved")
     
     def on_settings_click(self, widget):
         """Show settings window"""
+        # Built on first use; most sessions never open it
+        if self.settings_window is None:
+            self.create_settings_window()
         self.settings_window.present()
     
     def on_settings_close(self, window):
@@ -673,27 +1417,79 @@ class ClickPasteApp:
     
     def start_track(self):
         """Start target selection mode"""
-        if self.selecting_target:
+        if self.selecting_target or self._confirming:
             return
         
         self.selecting_target = True
         
+        # Read the clipboard while the user picks a target
+        self._prefetch_clipboard()
+        
         # Change cursor to crosshair (may not work on Wayland)
         if self.cursor_manager:
             self.cursor_manager.set_crosshair_cursor()
         
-        # Create overlay window
-        self.overlay_window = Gtk.Window()
-        self.overlay_window.set_decorated(False)
-        self.overlay_window.set_opacity(0.01)
+        # Minimize the fallback window if it exists
+        if self.fallback_window:
+            self.fallback_window.minimize()
+        
+        # On X11 a pointer grab picks the target without any window
+        if self._start_grab():
+            return
+        
+        # Overlay window is built once and reused for every selection
+        if self.overlay_window is None:
+            self._create_overlay_window()
         
         # Fullscreen
-        display = Gdk.Display.get_default()
-        monitor = display.get_primary_monitor()
+        monitor = self._display.get_primary_monitor()
         if monitor:
             geometry = monitor.get_geometry()
             self.overlay_window.set_default_size(geometry.width, geometry.height)
         
+        self.overlay_window.fullscreen()
+        self.overlay_window.present()
+    
+    def _start_grab(self) -> bool:
+        """Select the target through an X pointer grab, False to use the overlay"""
+        if not self.cursor_manager:
+            return False
+        if not self.cursor_manager.grab_input():
+            return False
+        
+        display = self._get_x_display()
+        if self._escape_keycode is None:
+            self._escape_keycode = display.keysym_to_keycode(_xlib_loader()[1].XK_Escape)
+        
+        # Grabbed events arrive on the shared X connection
+        self._grab_watch = GLib.unix_fd_add_full(
+            GLib.PRIORITY_DEFAULT, display.fileno(), GLib.IOCondition.IN,
+            self._on_grab_events
+        )
+        return True
+    
+    def _on_grab_events(self, fd, condition):
+        """Handle pointer and key events while the grab is active"""
+        X = _xlib_loader()[0]
+        display = self.x_display
+        while self._grab_watch and display.pending_events():
+            event = display.next_event()
+            if event.type == X.ButtonRelease:
+                # Wait for the release so it does not reach the target
+                self.end_track()
+                GLib.idle_add(self.start_typing, priority=GLib.PRIORITY_DEFAULT_IDLE)
+            elif event.type == X.KeyPress and event.detail == self._escape_keycode:
+                self.end_track()
+        return bool(self._grab_watch)
+    
+    def _create_overlay_window(self):
+        """Create the hidden click-catching overlay"""
+        self.overlay_window = Gtk.Window()
+        self.overlay_window.set_decorated(False)
+        self.overlay_window.set_opacity(0.01)
+        self.overlay_window.set_hide_on_close(True)
+        self.overlay_window.connect("unmap", self._on_overlay_unmap)
+        
         # Event handlers
         click_controller = Gtk.GestureClick()
         click_controller.connect("pressed", self.on_target_clicked)
@@ -702,13 +1498,6 @@ class ClickPasteApp:
         key_controller = Gtk.EventControllerKey()
         key_controller.connect("key-pressed", self.on_overlay_key_pressed)
         self.overlay_window.add_controller(key_controller)
-        
-        self.overlay_window.fullscreen()
-        self.overlay_window.present()
-        
-        # Minimize the fallback window if it exists
-        if self.fallback_window:
-            self.fallback_window.minimize()
     
     def end_track(self):
         """End target selection mode"""
@@ -718,10 +1507,15 @@ class ClickPasteApp:
         if self.cursor_manager:
             self.cursor_manager.restore_cursor()
         
-        # Close overlay
+        # Release the X grab if that is how the target was picked
+        if self._grab_watch:
+            GLib.source_remove(self._grab_watch)
+            self._grab_watch = 0
+            self.cursor_manager.ungrab_input()
+        
+        # Hide overlay, keeping it around for the next selection
         if self.overlay_window:
-            self.overlay_window.destroy()
-            self.overlay_window = None
+            self.overlay_window.set_visible(False)
         
         # Restore fallback window if needed
         if self.fallback_window:
@@ -736,98 +1530,377 @@ class ClickPasteApp:
     
     def on_target_clicked(self, gesture, n_press, x, y):
         """Handle target click"""
+        # Typing starts once the overlay is gone, so keys reach the target
+        self._paste_on_unmap = True
         self.end_track()
-        
-        # Small delay before typing
-        GLib.timeout_add(100, self.start_typing)
+    
+    def _on_overlay_unmap(self, widget):
+        """Start a pending paste after the overlay has been unmapped"""
+        if self._paste_on_unmap:
+            self._paste_on_unmap = False
+            GLib.idle_add(self.start_typing, priority=GLib.PRIORITY_DEFAULT_IDLE)
+    
+    def _invalidate_clipboard_cache(self, *args):
+        """Forget prefetched text and ignore any read still in flight"""
+        self._clipboard_generation += 1
+        self._cached_clipboard_text = None
+    
+    def _prefetch_clipboard(self, *args):
+        """Start reading the clipboard before the target is clicked"""
+        if self._clipboard:
+            self._invalidate_clipboard_cache()
+            # Freshness counts from when the read started
+            self._cached_clipboard_time = time.monotonic()
+            self._clipboard.read_text_async(None, self._cache_clipboard_cb,
+                                            self._clipboard_generation)
+    
+    def _cache_clipboard_cb(self, clipboard, result, generation: int):
+        """Keep prefetched clipboard text for start_typing"""
+        try:
+            text = clipboard.read_text_finish(result)
+        except Exception as e:
+            logger.debug(f"Clipboard prefetch failed: {e}")
+            return
+        if generation == self._clipboard_generation:
+            self._cached_clipboard_text = text
+            self._cached_clipboard_generation = generation
     
     def start_typing(self):
         """Start typing the clipboard contents"""
-        # Get clipboard text
-        clipboard = Gdk.Display.get_default().get_clipboard()
+        # Use the prefetched text only if it belongs to this selection and
+        # is still fresh
+        cached = self._cached_clipboard_text
+        fresh = (self._cached_clipboard_generation == self._clipboard_generation and
+                 time.monotonic() - self._cached_clipboard_time < self.CLIPBOARD_TTL)
+        self._invalidate_clipboard_cache()
+        if cached and fresh:
+            self._paste_text(cached)
+        else:
+            self._clipboard.read_text_async(None, self._on_clipboard_read)
+        return False
+    
+    def _on_clipboard_read(self, clipboard, result):
+        """Finish reading the clipboard for start_typing"""
+        try:
+            text = clipboard.read_text_finish(result)
+        except Exception as e:
+            logger.error(f"Clipboard error: {e}")
+            self.show_notification("Error", str(e))
+            return
+        self._paste_text(text)
+    
+    def _paste_text(self, text: Optional[str]):
+        """Paste clipboard text, however it was obtained"""
+        if not text:
+            self.show_notification("Clipboard Empty", 
+                                 "Nothing to paste")
+            return
+        self._confirm_paste(text)
+    
+    def _confirm_paste(self, text: str):
+        """Ask before typing long pastes, without blocking the main loop"""
+        if not self.settings.confirm or len(text) <= self.settings.confirm_over:
+            self._queue_paste(text)
+            return
         
-        def clipboard_callback(clipboard, result):
-            try:
-                text = clipboard.read_text_finish(result)
-                if not text:
-                    self.show_notification("Clipboard Empty", 
-                                         "Nothing to paste")
-                    return
-                
-                # Start typing in thread
-                self.typing_active = True
-                threading.Thread(
-                    target=self._type_text_thread,
-                    args=(text,),
-                    daemon=True
-                ).start()
-                
-            except Exception as e:
-                logger.error(f"Clipboard error: {e}")
-                self.show_notification("Error", str(e))
+        # One question at a time; a repeated paste does not stack dialogs
+        if self._confirming:
+            logger.info("Confirmation already open, ignoring paste")
+            return
+        self._confirming = True
         
-        clipboard.read_text_async(None, clipboard_callback)
-        return False
+        # The dialog takes keyboard focus, so remember the target to hand
+        # focus back to before typing
+        target = self._input_focus()
+        
+        dialog = Gtk.AlertDialog()
+        dialog.set_message("Type Clipboard?")
+        dialog.set_detail(f"The clipboard holds {len(text)} characters. Type them all?")
+        dialog.set_buttons(["Cancel", "Type"])
+        dialog.set_cancel_button(0)
+        dialog.set_default_button(1)
+        dialog.set_modal(True)
+        dialog.choose(None, None, self._on_confirm_response, (text, target))
     
-    def _type_text_thread(self, text: str):
-        """Type text in separate thread"""
+    def _on_confirm_response(self, dialog, result, data):
+        """Continue the paste once the user has answered"""
+        self._confirming = False
+        text, target = data
+        try:
+            answer = dialog.choose_finish(result)
+        except GLib.Error as e:
+            logger.debug(f"Confirmation dismissed: {e}")
+            return
+        if answer == 1:
+            self._queue_paste(text, target)
+    
+    def _input_focus(self) -> Optional[int]:
+        """X window id with keyboard focus, or None if it cannot be told"""
+        if not self.cursor_manager:
+            return None
+        try:
+            focus = self._get_x_display().get_input_focus().focus
+        except Exception as e:
+            logger.debug(f"Cannot query input focus: {e}")
+            return None
+        # None and PointerRoot come back as plain ints
+        return getattr(focus, 'id', None)
+    
+    def _queue_paste(self, text: str, focus: Optional[int] = None):
+        """Hand text off to the typing worker, optionally once focus is back"""
+        self.typing_active = True
+        self._paste_queue.put((text, focus))
+    
+    def _post_ui(self, func: Callable, *args):
+        """Run func on the main loop from the worker, unless we exit first"""
+        self._ui_calls.put((func, args))
+        try:
+            os.write(self._ui_wake_w, b'x')
+        except BlockingIOError:
+            pass  # Main loop already has wakeups pending
+    
+    def _dispatch_ui_calls(self, fd, condition):
+        """Run every call the worker has posted since the last wakeup"""
+        try:
+            while os.read(fd, 64):
+                pass
+        except BlockingIOError:
+            pass
+        while True:
+            try:
+                func, args = self._ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            if not self._shutting_down:
+                func(*args)
+        return True
+    
+    def _cancel_typing(self):
+        """Drop queued pastes and stop the one being typed"""
+        try:
+            while True:
+                self._paste_queue.get_nowait()
+        except queue.Empty:
+            pass
+        if self.input_simulator:
+            self.input_simulator.cancel()
+    
+    def _paste_worker(self):
+        """Type queued pastes one after another"""
+        self._raise_worker_priority()
+        while True:
+            self._worker_idle.set()
+            text, focus = self._paste_queue.get()
+            self._worker_idle.clear()
+            self._type_text_thread(text, focus)
+    
+    def _raise_worker_priority(self):
+        """Reduce keystroke timing jitter; needs RLIMIT_NICE or CAP_SYS_NICE"""
+        # Not real-time: _paced_iter spins between keys, and a spinning
+        # SCHED_FIFO thread would starve the X server or compositor that
+        # has to process the events. On Linux nice applies to this thread.
+        try:
+            os.nice(-5)
+            logger.info("Typing worker running at nice -5")
+        except OSError:
+            logger.debug("Typing worker running at normal priority")
+    
+    def _type_text_thread(self, text: str, focus: Optional[int] = None):
+        """Type text on the worker thread"""
+        success, error = False, None
         try:
             # Change tray icon to indicate typing (if available)
             if self.indicator:
-                GLib.idle_add(self._set_typing_icon, True)
+                self._post_ui(self._set_typing_icon, True)
             
-            # Initial delay
-            time.sleep(0.1 + self.settings.start_delay_ms / 1000.0)
+            # Cleared once per paste; a cancel during any of the waits below
+            # then stops the paste
+            simulator = self.input_simulator
+            cancel_token = simulator.cancel_token
+            simulator.reset_cancel()
+            if self._shutting_down:
+                return
             
-            # Type the text
-            success = self.input_simulator.type_text(text, self.settings.key_delay_ms)
+            # Initial delay, cut short by a cancel
+            if cancel_token.wait(0.1 + self.settings.start_delay_ms / 1000.0):
+                return
             
-            if not success:
-                GLib.idle_add(self.show_notification, "Typing Cancelled", 
-                            "Paste operation was cancelled")
+            # Keys must not land in a dialog that is still closing
+            if focus is not None:
+                self._wait_for_focus(focus, cancel_token)
+            
+            # Held modifiers (e.g. from a shortcut) would alter typed keys
+            self._wait_for_modifier_release(cancel_token)
+            if cancel_token.is_set():
+                return
+            
+            # Type the text
+            simulator.keydown_hold_ms = self.settings.keydown_hold_ms
+            success = simulator.type_text(text, self.settings.key_delay_ms)
             
         except Exception as e:
             logger.error(f"Typing error: {e}")
-            GLib.idle_add(self.show_notification, "Error", str(e))
+            error = str(e)
         finally:
             self.typing_active = False
-            if self.indicator:
-                GLib.idle_add(self._set_typing_icon, False)
+            # All UI updates for the end of a paste in one dispatch
+            self._post_ui(self._finish_typing, success, error)
+    
+    # Longest time on_exit waits for a cancelled paste to stop
+    EXIT_CANCEL_TIMEOUT = 1.0
+    
+    # Longest time to wait for the paste target to get focus back
+    FOCUS_WAIT_TIMEOUT = 2.0
+    
+    def _wait_for_focus(self, window: int, cancel_token: threading.Event):
+        """Block until the given X window has keyboard focus again"""
+        deadline = time.monotonic() + self.FOCUS_WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            if self._input_focus() == window:
+                return
+            if cancel_token.wait(0.01):
+                return
+        logger.warning("Paste target did not get focus back, typing anyway")
+    
+    # Longest time to wait for modifier keys to be released
+    MODIFIER_WAIT_TIMEOUT = 5.0
+    
+    def _modifier_mask(self) -> int:
+        """256-bit mask of all modifier keycodes, discovered once from the keymap"""
+        if self._mod_mask is None:
+            mapping = self._get_x_display().get_modifier_mapping()
+            mask = 0
+            for kc in {kc for row in mapping for kc in row if kc}:
+                mask |= 1 << kc
+            self._mod_mask = mask
+        return self._mod_mask
+    
+    def _wait_for_modifier_release(self, cancel_token: threading.Event):
+        """Block until no modifier key is held down or the paste is cancelled"""
+        if not self.cursor_manager:
+            return
+        try:
+            display = self._get_x_display()
+            mask = self._modifier_mask()
+        except Exception as e:
+            logger.debug(f"Cannot check modifier state: {e}")
+            return
+        
+        # Poll quickly at first so a prompt release starts typing right
+        # away, backing off for long holds
+        interval = 0.01
+        deadline = time.monotonic() + self.MODIFIER_WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            keymap = display.query_keymap()
+            # query_keymap is 32 bytes, bit (kc & 7) of byte (kc >> 3) per key
+            if not int.from_bytes(bytes(keymap), 'little') & mask:
+                return
+            if cancel_token.wait(interval):
+                return
+            interval = min(interval * 1.5, 0.1)
+        logger.warning("Modifier keys still held, typing anyway")
+    
+    def _finish_typing(self, success: bool, error: Optional[str]):
+        """Restore the icon and report the paste result on the main loop"""
+        self._set_typing_icon(False)
+        if error:
+            self.show_notification("Error", error)
+        elif not success:
+            self.show_notification("Typing Cancelled", 
+                                 "Paste operation was cancelled")
+        return False
     
     def _set_typing_icon(self, typing: bool):
         """Change tray icon to indicate typing"""
         if self.indicator:
-            if typing:
-                # Use a different icon to indicate typing
-                self.indicator.set_icon("media-playback-start")
-            else:
-                # Restore original icon
-                self.indicator.set_icon(self.original_icon)
+            # Use a different icon to indicate typing, else restore the original
+            icon_name = "media-playback-start" if typing else self.original_icon
+            try:
+                self.indicator.set_icon(icon_name, "LinuxClickPaste")
+            except Exception as e:
+                logger.debug(f"Cannot change tray icon: {e}")
+    
+    # Bus names Gio.Notification can deliver to when owned or activatable
+    NOTIFICATION_SERVERS = ('org.gtk.Notifications', 'org.freedesktop.Notifications')
+    
+    def _notification_server_available(self) -> bool:
+        """Check the session bus for a notification server, caching a hit"""
+        if self._notification_server:
+            return True
+        try:
+            bus = self.app.get_dbus_connection() or Gio.bus_get_sync(Gio.BusType.SESSION, None)
+            activatable = self._bus_call(bus, 'ListActivatableNames', None, '(as)')
+            self._notification_server = any(
+                name in activatable or
+                self._bus_call(bus, 'NameHasOwner', GLib.Variant('(s)', (name,)), '(b)')
+                for name in self.NOTIFICATION_SERVERS
+            )
+        except GLib.Error as e:
+            logger.debug(f"Cannot look for a notification server: {e}")
+        return self._notification_server
+    
+    @staticmethod
+    def _bus_call(bus, method: str, args, reply: str):
+        """Call a method on the bus daemon and return its single result"""
+        return bus.call_sync('org.freedesktop.DBus', '/org/freedesktop/DBus',
+                             'org.freedesktop.DBus', method, args,
+                             GLib.VariantType(reply), Gio.DBusCallFlags.NONE,
+                             -1, None).unpack()[0]
     
     def show_notification(self, title: str, message: str):
         """Show desktop notification"""
         if not self.settings.show_notifications:
             return
         
-        try:
-            subprocess.run([
-                'notify-send',
-                '--app-name=LinuxClickPaste',
-                '--icon=edit-paste',
-                title,
-                message
-            ], check=False)
-        except:
+        # send_notification reports no delivery failure, so check first that
+        # a notification server is there to receive it
+        if not self._notification_server_available():
             print(f"{title}: {message}")
+        elif self.app.get_dbus_connection():
+            # Send over the application's own D-Bus connection
+            notification = Gio.Notification.new(title)
+            notification.set_body(message)
+            notification.set_icon(Gio.ThemedIcon.new('edit-paste'))
+            self.app.send_notification('linuxclickpaste', notification)
+        elif self._notify_argv is None:
+            print(f"{title}: {message}")
+        else:
+            # Not registered on the bus ourselves; notify-send connects itself
+            try:
+                # Not awaited; GLib spawns it without forking this process,
+                # and its output is discarded rather than sharing our TTY
+                Gio.Subprocess.new([*self._notify_argv, title, message],
+                                   Gio.SubprocessFlags.STDOUT_SILENCE |
+                                   Gio.SubprocessFlags.STDERR_SILENCE)
+            except GLib.Error as e:
+                logger.debug(f"notify-send failed: {e}")
+                print(f"{title}: {message}")
     
     def on_exit(self, widget):
         """Exit application"""
         self.end_track()
-        self.settings.save(self.settings_path)
+        
+        # Set before cancelling so a paste the worker has just dequeued
+        # sees it after clearing the cancel flag; UI callbacks are dropped
+        self._shutting_down = True
+        GLib.source_remove(self._ui_watch)
+        
+        # Stop typing and let the worker finish (e.g. terminating xdotool)
+        # before the process exits
+        self._cancel_typing()
+        worker_stopped = self._worker_idle.wait(self.EXIT_CANCEL_TIMEOUT)
+        if not worker_stopped:
+            logger.warning("Typing worker did not stop before exit")
+        self._do_save()
         
         # Cleanup
         if self.cursor_manager:
             self.cursor_manager.restore_cursor()
+            self.cursor_manager.close()
+        # A worker still typing would emit on a closed connection (a freed
+        # Display* for libXtst); process exit releases it instead
+        if self.input_simulator and worker_stopped:
+            self.input_simulator.close()
         
         self.app.quit()
     
@@ -854,7 +1927,7 @@ def main():
     
     try:
         lock_fd = open(lock_file, 'w')
-        fcntl.lockf(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        fcntl.flock(lock_fd.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
     except IOError:
         print("LinuxClickPaste is already running")
         sys.exit(1)
@@ -867,10 +1940,9 @@ def main():
         logger.error(f"Fatal error: {e}")
         sys.exit(1)
     finally:
-        # Cleanup
+        # Closing releases the lock; the file itself stays for the next run
         try:
             lock_fd.close()
-            lock_file.unlink()
         except:
             pass
 